@@ -1,8 +1,8 @@
 """
 Учебный конфигурационный язык (вариант №28).
 
-Требования из задания соблюдены, используется
-специализированный инструмент синтаксического разбора — Lark.
+Разбор выполняется собственным лексером и парсером (рекурсивный спуск).
+Альтернативная реализация на Lark доступна явно в модуле config_lang_lark.
 
 Поддерживаемые конструкции:
 - Многострочные комментарии: {{! ... }}
@@ -23,10 +23,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
-
-from lark import Lark, Transformer
-from lark.exceptions import UnexpectedCharacters, UnexpectedInput
+import copy
+import functools
+import re
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple
 
 
 class LexError(Exception):
@@ -37,66 +38,41 @@ class ParseError(Exception):
     """Ошибки синтаксического анализа или семантики."""
 
 
-GRAMMAR = r"""
-    start: stmt+
-
-    stmt: IDENT "=" expr      -> assign
-
-    ?expr: NUMBER             -> number
-         | "list" "(" [expr ("," expr)*] ")"   -> list
-         | "begin" dict_item* "end"            -> dict
-         | IDENT                               -> ident
-
-    dict_item: IDENT ":=" expr ";"             -> dict_pair
-
-    // Числа: 0 или восьмеричные с опциональным префиксом o/O, допускаем лидирующие нули.
-    NUMBER: "0" | "0" ("o"|"O")? ("0".."7")+
-    IDENT: /[a-z][a-z0-9_]*/
-
-    COMMENT: /{{![\s\S]*?}}/
-
-    %import common.WS
-    %ignore WS
-    %ignore COMMENT
-"""
-
-
-class _AstBuilder(Transformer):
-    """Преобразует дерево Lark в простой Python AST."""
-
-    def start(self, items: List[Any]) -> List[Any]:
-        return items
-
-    def assign(self, items: List[Any]) -> Dict[str, Any]:
-        name, expr = items
-        return {"type": "assign", "name": name, "expr": expr}
-
-    def number(self, items: List[Any]) -> Dict[str, Any]:
-        (token,) = items
-        return {"type": "number", "value": str(token)}
-
-    def ident(self, items: List[Any]) -> Dict[str, Any]:
-        (token,) = items
-        return {"type": "ident", "name": str(token)}
-
-    def list(self, items: List[Any]) -> Dict[str, Any]:
-        return {"type": "list", "items": items}
-
-    def dict(self, items: List[Any]) -> Dict[str, Any]:
-        return {"type": "dict", "items": items}
-
-    def dict_pair(self, items: List[Any]) -> Dict[str, Any]:
-        key, value = items
-        return {"key": key, "value": value}
-
-    def IDENT(self, token):  # type: ignore[override]
-        return str(token)
-
-    def NUMBER(self, token):  # type: ignore[override]
-        return str(token)
-
-
-_parser = Lark(GRAMMAR, parser="lalr", start="start", propagate_positions=True)
+class TokenStream(NamedTuple):
+    """Лексемы в виде параллельных списков: i-я лексема — это kinds[i],
+    values[i] и её позиция lines[i], cols[i] (с единицы). text — исходный
+    текст, из него берутся лексемы для сообщений об ошибках."""
+
+    kinds: List[str]
+    values: List[Any]
+    lines: List[int]
+    cols: List[int]
+    text: str
+
+
+# Ключевые слова интернированы: идентификаторы из лексера тоже интернируются,
+# поэтому парсер сравнивает их по идентичности (is), а не посимвольно.
+_LIST = sys.intern("list")
+_BEGIN = sys.intern("begin")
+_END = sys.intern("end")
+KEYWORDS = {_LIST, _BEGIN, _END}
+
+# Единое регулярное выражение для всех лексем: основной цикл сканирования
+# выполняется движком re, а не посимвольно на Python. Подряд идущие пробелы
+# и комментарии пропускаются одним совпадением SKIP. Пробелы — только ASCII
+# (как common.WS в Lark): \s в str-шаблоне совпал бы и с Unicode-пробелами.
+TOKEN_RE = re.compile(
+    r"(?P<SKIP>(?:[ \t\f\r\n]+|\{\{!.*?\}\})+)"
+    r"|(?P<IDENT>[a-z][a-z0-9_]*)"
+    r"|(?P<NUMBER>0[oO]?[0-7]+|0)"
+    r"|(?P<ASSIGN>:=)"
+    r"|(?P<LPAREN>\()"
+    r"|(?P<RPAREN>\))"
+    r"|(?P<COMMA>,)"
+    r"|(?P<SEMI>;)"
+    r"|(?P<EQ>=)",
+    re.DOTALL,
+)
 
 
 def _number_value(lexeme: str) -> int:
@@ -111,56 +87,216 @@ def _number_value(lexeme: str) -> int:
     return int(digits, 8)
 
 
-def _eval_expr(node: Dict[str, Any], env: Dict[str, Any]) -> Any:
-    ntype = node["type"]
-
-    if ntype == "number":
-        return _number_value(node["value"])
-
-    if ntype == "ident":
-        name = node["name"]
-        if name not in env:
+class Lexer:
+    """Лексический анализатор: текст -> список лексем."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def tokens(self) -> TokenStream:
+        text = self.text
+        kinds: List[str] = []
+        values: List[Any] = []
+        lines: List[int] = []
+        cols: List[int] = []
+        line = 1
+        line_start = 0
+        prev_end = 0
+        for match in TOKEN_RE.finditer(text):
+            start = match.start()
+            if start != prev_end:
+                self._error(prev_end, line, line_start)
+            end = match.end()
+            kind = match.lastgroup
+            if kind == "SKIP":
+                newlines = text.count("\n", start, end)
+                if newlines:
+                    line += newlines
+                    line_start = text.rindex("\n", start, end) + 1
+            else:
+                value = match.group()
+                if kind == "IDENT":
+                    value = sys.intern(value)
+                    if value in KEYWORDS:
+                        kind = "KW"
+                elif kind == "NUMBER":
+                    # значение числа вычисляется один раз, при сканировании
+                    value = _number_value(value)
+                kinds.append(kind)
+                values.append(value)
+                lines.append(line)
+                cols.append(start - line_start + 1)
+            prev_end = end
+        if prev_end != len(text):
+            self._error(prev_end, line, line_start)
+        kinds.append("EOF")
+        values.append("")
+        lines.append(line)
+        cols.append(prev_end - line_start + 1)
+        return TokenStream(kinds, values, lines, cols, text)
+
+    def _error(self, pos: int, line: int, line_start: int) -> None:
+        where = f"строка {line}, столбец {pos - line_start + 1}"
+        if self.text.startswith("{{!", pos):
+            raise LexError(f"Незакрытый комментарий ({where})")
+        raise LexError(f"Неожиданный символ {self.text[pos]!r} ({where})")
+
+
+class Parser:
+    """Рекурсивный спуск по лексемам с вычислением значений констант."""
+
+    def __init__(self, tokens: TokenStream) -> None:
+        self.kinds, self.values, self.lines, self.cols, self.text = tokens
+        self.pos = 0
+        self.consts: Dict[str, Any] = {}
+
+    def parse(self) -> Dict[str, Any]:
+        kinds = self.kinds
+        if kinds[self.pos] == "EOF":
+            raise ParseError("Программа не содержит ни одного объявления")
+        while kinds[self.pos] != "EOF":
+            self._parse_const_declaration()
+        return self.consts
+
+    def _error(self, message: str) -> ParseError:
+        pos = self.pos
+        found = repr(self._lexeme(pos)) if self.kinds[pos] != "EOF" else "конец ввода"
+        return ParseError(
+            f"Синтаксическая ошибка: {message}, получено {found} "
+            f"(строка {self.lines[pos]}, столбец {self.cols[pos]})"
+        )
+
+    def _lexeme(self, pos: int) -> str:
+        """Исходная запись лексемы: в values числа уже вычислены."""
+        text = self.text
+        offset = 0
+        for _ in range(self.lines[pos] - 1):
+            offset = text.index("\n", offset) + 1
+        return TOKEN_RE.match(text, offset + self.cols[pos] - 1).group()
+
+    # Проверки ожидаемых лексем встроены в методы разбора: это самые частые
+    # операции парсера, и отдельный вызов метода на каждую лексему заметно
+    # дороже сравнения с элементом списка kinds.
+
+    def _parse_const_declaration(self) -> None:
+        kinds = self.kinds
+        pos = self.pos
+        # ключевые слова допустимы как имена констант: в начале объявления
+        # выражение стоять не может, поэтому неоднозначности нет
+        if kinds[pos] != "IDENT" and kinds[pos] != "KW":
+            raise self._error("ожидалось IDENT")
+        name = self.values[pos]
+        if kinds[pos + 1] != "EQ":
+            self.pos = pos + 1
+            raise self._error("ожидалось EQ")
+        self.pos = pos + 2
+        value = self._parse_expr()
+        if name in self.consts:
+            raise ParseError(f"Константа '{name}' уже объявлена")
+        self.consts[name] = value
+
+    def _parse_expr(self) -> Any:
+        kind = self.kinds[self.pos]
+        dispatch = self._EXPR_DISPATCH
+        handler = dispatch.get(kind) or dispatch.get((kind, self.values[self.pos]))
+        if handler is None:
+            raise self._error("ожидалось значение")
+        return handler(self)
+
+    def _parse_number(self) -> int:
+        pos = self.pos
+        self.pos = pos + 1
+        return self.values[pos]
+
+    def _parse_ident_ref(self) -> Any:
+        pos = self.pos
+        self.pos = pos + 1
+        name = self.values[pos]
+        if name not in self.consts:
             raise ParseError(f"Использование необъявленной константы '{name}'")
-        return env[name]
-
-    if ntype == "list":
-        return [_eval_expr(item, env) for item in node["items"]]
+        return self.consts[name]
+
+    def _parse_list(self) -> List[Any]:
+        kinds = self.kinds
+        # ключевое слово list уже проверено в _parse_expr
+        self.pos += 1
+        if kinds[self.pos] != "LPAREN":
+            raise self._error("ожидалось LPAREN")
+        self.pos += 1
+        items: List[Any] = []
+        if kinds[self.pos] != "RPAREN":
+            items.append(self._parse_expr())
+            while kinds[self.pos] == "COMMA":
+                self.pos += 1
+                items.append(self._parse_expr())
+            if kinds[self.pos] != "RPAREN":
+                raise self._error("ожидалось RPAREN")
+        self.pos += 1
+        return items
 
-    if ntype == "dict":
+    def _parse_dict(self) -> Dict[str, Any]:
+        kinds = self.kinds
+        values = self.values
+        # ключевое слово begin уже проверено в _parse_expr
+        self.pos += 1
         result: Dict[str, Any] = {}
-        for pair in node["items"]:
-            key = pair["key"]
+        # ключом может быть и ключевое слово, кроме end, закрывающего словарь
+        while kinds[self.pos] == "IDENT" or (
+            kinds[self.pos] == "KW" and values[self.pos] is not _END
+        ):
+            key = values[self.pos]
+            self.pos += 1
+            if kinds[self.pos] != "ASSIGN":
+                raise self._error("ожидалось ASSIGN")
+            self.pos += 1
+            value = self._parse_expr()
+            if kinds[self.pos] != "SEMI":
+                raise self._error("ожидалось SEMI")
+            self.pos += 1
             if key in result:
                 raise ParseError(f"Ключ '{key}' в словаре уже использован")
-            result[key] = _eval_expr(pair["value"], env)
+            result[key] = value
+        if values[self.pos] is not _END or kinds[self.pos] != "KW":
+            raise self._error("ожидалось end")
+        self.pos += 1
         return result
 
-    raise ParseError(f"Неизвестный тип узла: {ntype}")
+    # Выбор правила для выражения — один поиск в словаре вместо цепочки if.
+    # Таблица общая для класса и хранит обычные функции, а не связанные
+    # методы, чтобы не создавать цикл ссылок экземпляр -> словарь -> метод.
+    _EXPR_DISPATCH: Dict[Any, Callable[["Parser"], Any]] = {
+        "NUMBER": _parse_number,
+        "IDENT": _parse_ident_ref,
+        ("KW", _LIST): _parse_list,
+        ("KW", _BEGIN): _parse_dict,
+        # в позиции выражения end ничего не закрывает — это ссылка на константу
+        ("KW", _END): _parse_ident_ref,
+    }
 
 
-def parse_config(text: str) -> Dict[str, Any]:
-    """Высокоуровневая функция: текст -> словарь констант.
-    Использует Lark для синтаксического разбора."""
-    try:
-        tree = _parser.parse(text)
-    except UnexpectedCharacters as exc:
-        raise LexError(str(exc)) from exc
-    except UnexpectedInput as exc:
-        # все прочие ошибки разбора считаем синтаксическими
-        raise ParseError(str(exc)) from exc
-
-    ast = _AstBuilder().transform(tree)
-
-    env: Dict[str, Any] = {}
-    for stmt in ast:
-        name = stmt["name"]
-        if name in env:
-            raise ParseError(f"Константа '{name}' уже объявлена")
-        value = _eval_expr(stmt["expr"], env)
-        env[name] = value
+# Входы больше этого размера не кэшируются, чтобы ограничить расход памяти.
+CACHE_MAX_SIZE = 1024 * 1024
+
+
+def _parse_config(text: str) -> Dict[str, Any]:
+    return Parser(Lexer(text).tokens()).parse()
 
-    return env
 
+@functools.lru_cache(maxsize=128)
+def _parse_config_cached(text: str) -> Dict[str, Any]:
+    # Кэшированный словарь наружу не отдаётся: parse_config возвращает его
+    # глубокую копию, так что изменения вызывающего не портят кэш.
+    return _parse_config(text)
+
+
+def parse_config(text: str) -> Dict[str, Any]:
+    """Высокоуровневая функция: текст -> словарь констант.
+    Результаты для повторяющихся текстов берутся из кэша."""
+    if len(text) > CACHE_MAX_SIZE:
+        return _parse_config(text)
+    # deepcopy сохраняет интернированные строки ключей и общие ссылки между
+    # константами (b = a), в отличие от сериализации
+    return copy.deepcopy(_parse_config_cached(text))
 
-__all__ = ["LexError", "ParseError", "parse_config"]
 
+__all__ = ["LexError", "ParseError", "TokenStream", "Lexer", "Parser", "parse_config"]
@@ -0,0 +1,144 @@
+"""
+Разбор учебного конфигурационного языка с помощью Lark (LALR).
+
+Альтернативная реализация, используется только явно (импорт этого
+модуля). Основной разбор — config_lang.parse_config: он быстрее и не
+требует Lark.
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+from typing import Any, Dict, List, Tuple
+
+from lark import Lark, Transformer
+from lark.exceptions import UnexpectedCharacters, UnexpectedInput
+
+from config_lang import LexError, ParseError, _number_value
+
+
+GRAMMAR = r"""
+    start: stmt+
+
+    stmt: IDENT "=" expr      -> assign
+
+    ?expr: NUMBER             -> number
+         | "list" "(" [expr ("," expr)*] ")"   -> list
+         | "begin" dict_item* "end"            -> dict
+         | IDENT                               -> ident
+
+    dict_item: IDENT ":=" expr ";"             -> dict_pair
+
+    // Числа: 0 или восьмеричные с опциональным префиксом o/O, допускаем лидирующие нули.
+    NUMBER: "0" | "0" ("o"|"O")? ("0".."7")+
+    IDENT: /[a-z][a-z0-9_]*/
+
+    COMMENT: /{{![\s\S]*?}}/
+
+    %import common.WS
+    %ignore WS
+    %ignore COMMENT
+"""
+
+
+class _AstBuilder(Transformer):
+    """Вычисляет значения констант прямо во время разбора LALR.
+
+    Экземпляр передаётся в Lark(transformer=...), поэтому дерево разбора
+    не строится вовсе. Таблица констант env заполняется по мере свёрток и
+    сбрасывается перед каждым разбором (см. parse_config).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.env: Dict[str, Any] = {}
+
+    def start(self, items: List[Any]) -> Dict[str, Any]:
+        return self.env
+
+    def assign(self, items: List[Any]) -> None:
+        name, value = items
+        name = sys.intern(str(name))
+        if name in self.env:
+            raise ParseError(f"Константа '{name}' уже объявлена")
+        self.env[name] = value
+
+    def number(self, items: List[Any]) -> int:
+        (token,) = items
+        return _number_value(str(token))
+
+    def ident(self, items: List[Any]) -> Any:
+        name = str(items[0])
+        if name not in self.env:
+            raise ParseError(f"Использование необъявленной константы '{name}'")
+        return self.env[name]
+
+    def list(self, items: List[Any]) -> List[Any]:
+        return list(items)
+
+    def dict(self, items: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for key, value in items:
+            if key in result:
+                raise ParseError(f"Ключ '{key}' в словаре уже использован")
+            result[key] = value
+        return result
+
+    def dict_pair(self, items: List[Any]) -> Tuple[str, Any]:
+        key, value = items
+        # одинаковые ключи во всех словарях результата — один и тот же объект
+        return sys.intern(str(key)), value
+
+
+# Вычислитель хранит состояние разбора, поэтому разборы сериализуются.
+_lock = threading.Lock()
+
+
+@functools.lru_cache()
+def _get_parser() -> Tuple[Lark, _AstBuilder]:
+    """Компилирует грамматику один раз за процесс (при первом обращении)."""
+    builder = _AstBuilder()
+    parser = Lark(GRAMMAR, parser="lalr", start="start", transformer=builder)
+    return parser, builder
+
+
+def _syntax_error(exc: UnexpectedInput) -> ParseError:
+    """Сообщение об ошибке по полям исключения Lark.
+
+    str(exc) здесь вызывать нельзя: для UnexpectedToken он перебирает
+    допустимые лексемы через интерактивный парсер, а тот выполняет свёртки
+    с настоящими методами _AstBuilder и меняет таблицу констант.
+    """
+    token = getattr(exc, "token", None)
+    if token is None or token.type == "$END":
+        found = "конец ввода"
+    else:
+        found = repr(str(token))
+    message = f"Синтаксическая ошибка: получено {found}"
+    if exc.line > 0:
+        message += f" (строка {exc.line}, столбец {exc.column})"
+    expected = getattr(exc, "expected", None)
+    if expected:
+        message += f", ожидалось одно из: {', '.join(sorted(expected))}"
+    return ParseError(message)
+
+
+def parse_config(text: str) -> Dict[str, Any]:
+    """Текст -> словарь констант с использованием Lark."""
+    parser, builder = _get_parser()
+    with _lock:
+        try:
+            return parser.parse(text)
+        except UnexpectedCharacters as exc:
+            raise LexError(str(exc)) from exc
+        except UnexpectedInput as exc:
+            # все прочие ошибки разбора считаем синтаксическими
+            raise _syntax_error(exc) from None
+        finally:
+            # результат уже возвращён вызывающему; следующий разбор начинается с нуля
+            builder.env = {}
+
+
+__all__ = ["GRAMMAR", "parse_config"]
@@ -1,10 +1,71 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
 import sys
+from typing import Any, Dict, Optional
 
+import config_lang
 from config_lang import LexError, ParseError, parse_config
 
+# Версия формата файлов кэша; увеличивается при изменении того, что в них хранится.
+CACHE_VERSION = 1
+
+
+def _parser_tag() -> bytes:
+    """Отпечаток реализации языка: хеш исходника config_lang.
+
+    Входит в ключ кэша, поэтому после любого изменения лексера или парсера
+    результаты, записанные прежней версией, больше не используются.
+    """
+    with open(config_lang.__file__, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+
+def _cache_file(src: str) -> Optional[str]:
+    """Путь к кэшу разбора для данного текста или None, если кэш отключён.
+
+    Кэш включается переменной окружения CONFIG_CACHE_PATH (каталог).
+    """
+    cache_dir = os.environ.get("CONFIG_CACHE_PATH")
+    if not cache_dir:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{CACHE_VERSION}".encode("ascii"))
+    digest.update(_parser_tag())
+    digest.update(src.encode("utf-8"))
+    key = digest.hexdigest()
+    return os.path.join(cache_dir, f"{key}.pkl")
+
+
+def _load_cached(path: str) -> Optional[Dict[str, Any]]:
+    """Читает результат разбора из кэша; повреждённый файл считается промахом."""
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except Exception:
+        # pickle.load может выбросить почти что угодно (ValueError, ImportError,
+        # AttributeError, ...) — любой нечитаемый файл просто игнорируем
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _store_cached(path: str, data: Dict[str, Any]) -> None:
+    """Сохраняет результат разбора; ошибки записи кэша не мешают работе CLI."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=5)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 
 def main() -> int:
     """Точка входа CLI.
@@ -13,11 +74,16 @@ def main() -> int:
     В случае ошибки выводит сообщение в stderr и возвращает код 1.
     """
     src = sys.stdin.read()
-    try:
-        data = parse_config(src)
-    except (LexError, ParseError) as exc:
-        print(f"Ошибка: {exc}", file=sys.stderr)
-        return 1
+    cache_path = _cache_file(src)
+    data = _load_cached(cache_path) if cache_path else None
+    if data is None:
+        try:
+            data = parse_config(src)
+        except (LexError, ParseError) as exc:
+            print(f"Ошибка: {exc}", file=sys.stderr)
+            return 1
+        if cache_path:
+            _store_cached(cache_path, data)
 
     json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
     print()  # завершающий перевод строки
@@ -26,5 +92,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
-
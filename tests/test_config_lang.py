@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import os
+import sys
 import unittest
 
-from config_lang import LexError, ParseError, parse_config
+import config_lang_lark
+from config_lang import Lexer, LexError, ParseError, parse_config
 
 
 class TestConfigLangBasic(unittest.TestCase):
@@ -75,6 +77,75 @@ class TestConfigLangBasic(unittest.TestCase):
         with self.assertRaises(ParseError):
             parse_config(src)
 
+    def test_keywords_as_names_and_keys(self) -> None:
+        self.assertEqual(parse_config("list = 0"), {"list": 0})
+        self.assertEqual(parse_config("end = 0"), {"end": 0})
+        self.assertEqual(parse_config("begin = 0"), {"begin": 0})
+        self.assertEqual(
+            parse_config("a = begin list := 0; begin := 01; end"),
+            {"a": {"list": 0, "begin": 1}},
+        )
+        with self.assertRaises(ParseError):
+            parse_config("a = begin end := 0; end")
+
+    def test_end_as_constant_reference(self) -> None:
+        self.assertEqual(parse_config("end = 0\nb = end"), {"end": 0, "b": 0})
+        self.assertEqual(parse_config("end = 0\nb = list(end)"), {"end": 0, "b": [0]})
+        self.assertEqual(
+            parse_config("end = 0\nb = begin x := end; end"), {"end": 0, "b": {"x": 0}}
+        )
+
+    def test_error_shows_source_lexeme(self) -> None:
+        with self.assertRaises(ParseError) as ctx:
+            parse_config("a = 0\nb = 0o10 0o10")
+        self.assertIn("получено '0o10' (строка 2, столбец 10)", str(ctx.exception))
+
+    def test_dict_keys_are_interned(self) -> None:
+        src = "a = begin port := 0; end\nb = begin port := 01; end\n"
+        # дважды: второй вызов берёт результат из кэша
+        for _ in range(2):
+            result = parse_config(src)
+            for name in ("a", "b"):
+                self.assertIs(next(iter(result[name])), sys.intern("port"))
+
+    def test_error_at_end_of_input(self) -> None:
+        with self.assertRaises(ParseError) as ctx:
+            parse_config("a =")
+        self.assertIn("получено конец ввода (строка 1, столбец 4)", str(ctx.exception))
+
+    def test_cached_result_is_not_shared(self) -> None:
+        src = "a = list(0)\nb = a\n"
+        first = parse_config(src)
+        first["a"].append(0o7)
+        second = parse_config(src)
+        self.assertEqual(second["a"], [0])
+        self.assertIs(second["a"], second["b"])
+
+
+class TestLexer(unittest.TestCase):
+    def test_tokens_kinds_and_positions(self) -> None:
+        src = "{{! c }}\nabc = list(0o7, 0)\n"
+        tokens = Lexer(src).tokens()
+        self.assertEqual(
+            tokens.kinds,
+            ["IDENT", "EQ", "KW", "LPAREN", "NUMBER", "COMMA", "NUMBER", "RPAREN", "EOF"],
+        )
+        self.assertEqual((tokens.lines[0], tokens.cols[0]), (2, 1))
+        self.assertEqual((tokens.values[4], tokens.cols[4]), (7, 12))
+
+    def test_unexpected_character_raises(self) -> None:
+        with self.assertRaises(LexError):
+            Lexer("a = 0\nb = 09\n").tokens()
+
+    def test_non_ascii_whitespace_raises(self) -> None:
+        for src in ("a = 0\xa0", "a = 0\x1c", "a =\u20030"):
+            with self.assertRaises(LexError):
+                Lexer(src).tokens()
+
+    def test_unterminated_comment_raises(self) -> None:
+        with self.assertRaises(LexError):
+            Lexer("{{! без конца\na = 0").tokens()
+
 
 class TestExampleConfigs(unittest.TestCase):
     def _read_example(self, name: str) -> str:
@@ -103,6 +174,38 @@ class TestExampleConfigs(unittest.TestCase):
         self.assertIsInstance(device["sensors"], list)
 
 
+class TestLarkBackend(unittest.TestCase):
+    def test_matches_hand_parser_on_examples(self) -> None:
+        base = os.path.join(os.path.dirname(os.path.dirname(__file__)), "examples")
+        for name in ("web_server.conf", "iot_device.conf"):
+            with open(os.path.join(base, name), "r", encoding="utf8") as f:
+                src = f.read()
+            self.assertEqual(config_lang_lark.parse_config(src), parse_config(src))
+
+    def test_errors(self) -> None:
+        with self.assertRaises(LexError):
+            config_lang_lark.parse_config("a = 09\n")
+        with self.assertRaises(ParseError):
+            config_lang_lark.parse_config("a = b")
+        with self.assertRaises(ParseError):
+            config_lang_lark.parse_config("a = begin x := 0; x := 0; end")
+
+    def test_syntax_error_message(self) -> None:
+        with self.assertRaises(ParseError) as ctx:
+            config_lang_lark.parse_config("x = begin end = 0; end")
+        message = str(ctx.exception)
+        self.assertIn("получено '='", message)
+        self.assertIn("строка 1, столбец 15", message)
+        # следующий разбор не видит констант из неудачного
+        self.assertEqual(config_lang_lark.parse_config("x = 0"), {"x": 0})
+
+    def test_dict_keys_are_interned(self) -> None:
+        src = "a = begin port := 0; end\nb = begin port := 01; end\n"
+        result = config_lang_lark.parse_config(src)
+        for name in ("a", "b"):
+            self.assertIs(next(iter(result[name])), sys.intern("port"))
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+
+SRC = "a = 0o10\nb = list(a)\n"
+
+
+class TestCliCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._tmp.name, "cache")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run(self, src: str = SRC, cache_dir: str | None = None) -> tuple[int, str]:
+        env = {"CONFIG_CACHE_PATH": cache_dir or self.cache_dir}
+        stdout = io.StringIO()
+        with mock.patch.dict(os.environ, env), mock.patch("sys.stdin", io.StringIO(src)), \
+                mock.patch("sys.stdout", stdout):
+            code = main.main()
+        return code, stdout.getvalue()
+
+    def _cache_file(self) -> str:
+        with mock.patch.dict(os.environ, {"CONFIG_CACHE_PATH": self.cache_dir}):
+            path = main._cache_file(SRC)
+        assert path is not None
+        return path
+
+    def test_miss_writes_cache(self) -> None:
+        code, out = self._run()
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), {"a": 8, "b": [8]})
+        with open(self._cache_file(), "rb") as f:
+            self.assertEqual(pickle.load(f), {"a": 8, "b": [8]})
+
+    def test_hit_skips_parsing(self) -> None:
+        path = self._cache_file()
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            pickle.dump({"cached": 1}, f)
+        with mock.patch("main.parse_config") as parse:
+            code, out = self._run()
+        parse.assert_not_called()
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), {"cached": 1})
+
+    def test_key_depends_on_parser_version(self) -> None:
+        path = self._cache_file()
+        with mock.patch.dict(os.environ, {"CONFIG_CACHE_PATH": self.cache_dir}):
+            with mock.patch("main._parser_tag", return_value=b"other"):
+                self.assertNotEqual(main._cache_file(SRC), path)
+            with mock.patch("main.CACHE_VERSION", main.CACHE_VERSION + 1):
+                self.assertNotEqual(main._cache_file(SRC), path)
+
+    def test_corrupt_file_is_a_miss(self) -> None:
+        path = self._cache_file()
+        os.makedirs(os.path.dirname(path))
+        # мусор, ссылка на несуществующий модуль и не-словарь
+        for payload in (b"garbage", b"cfoo\nbar\n.", pickle.dumps([1, 2])):
+            with open(path, "wb") as f:
+                f.write(payload)
+            code, out = self._run()
+            self.assertEqual(code, 0)
+            self.assertEqual(json.loads(out), {"a": 8, "b": [8]})
+
+    def test_unwritable_directory_is_ignored(self) -> None:
+        blocker = os.path.join(self._tmp.name, "file")
+        with open(blocker, "w", encoding="utf8") as f:
+            f.write("")
+        code, out = self._run(cache_dir=os.path.join(blocker, "cache"))
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), {"a": 8, "b": [8]})
+
+
+if __name__ == "__main__":
+    unittest.main()